@@ -6,7 +6,7 @@
 # AWS Free Tier Instance Manager - Complete lifecycle management for EC2 free tier instances
 #
 # What this script does step by step:
-# 1. Checks and auto-installs dependencies (boto3, python-dotenv, awscli) and validates GitHub CLI
+# 1. Checks and auto-installs dependencies (boto3, cryptography)
 # 2. Validates AWS credentials from ~/.env file
 # 3. Provides command-line interface for:
 #    - Creating t3.micro instances with Ubuntu Server 24.04 LTS
@@ -15,14 +15,14 @@
 #    - SSH access to running instances with local key management
 #    - Opening AWS web console in browser
 # 4. Enforces free tier limits (max 1 t3.micro instance at a time)
-# 5. Generates SSH key pairs locally using ssh-keygen and imports public keys to AWS
+# 5. Generates SSH key pairs locally (in-process via cryptography) and imports public keys to AWS
 # 6. Creates security groups with SSH access automatically
 # 7. Handles all AWS API interactions with proper error handling
 #
 # Key features:
 # - Free tier enforcement to prevent accidental charges
 # - Local SSH key generation for enhanced security
-# - Smart dependency management including GitHub CLI
+# - Smart dependency management
 # - Streamlined command interface with essential operations
 # - Comprehensive error handling and user guidance
 # - Platform-specific installation instructions
@@ -42,45 +42,127 @@ Requirements:
 """
 
 import sys
+import argparse
 import subprocess
 import os
+import json
+import time
+import functools
+import operator
+import hashlib
+import shutil
+import importlib.util
 import webbrowser
 
+# Local cache for slow-changing AWS lookups (AMI IDs, etc.)
+CACHE_DIR = os.path.expanduser('~/.cache/aws-free')
+AMI_CACHE_MAX_AGE = 7 * 24 * 60 * 60     # Ubuntu AMIs are refreshed roughly monthly
+CACHE_PURGE_AGE = 30 * 24 * 60 * 60
+SG_REVALIDATE_AGE = 24 * 60 * 60
+KEY_PAIR_CACHE_MAX_AGE = 24 * 60 * 60
+INSTANCE_CACHE_MAX_AGE = 60     # Short TTL - only meant to cover list followed by delete
+
+# describe_instances filters shared by the commands
+# (ssh only looks at running instances; everything else includes stopped/transitional ones)
+ACTIVE_STATES = ('pending', 'running', 'stopping', 'stopped')
+ACTIVE_FILTER = [{'Name': 'instance-state-name', 'Values': list(ACTIVE_STATES)}]
+RUNNING_FILTER = [{'Name': 'instance-state-name', 'Values': ['running']}]
+FREE_TIER_FILTER = [{'Name': 'instance-type', 'Values': ['t3.micro']}] + ACTIVE_FILTER
+
+
+def read_cache(name, max_age=None):
+    """Load a JSON cache entry, or None if it is missing, unreadable or older than max_age seconds"""
+    path = os.path.join(CACHE_DIR, name)
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) >= max_age:
+            return None
+        with open(path, 'r') as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(name, data):
+    """Store a JSON cache entry (best effort - caching must never break a command)"""
+    path = os.path.join(CACHE_DIR, name)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file and swap it in so readers never see a partial entry
+        with open(f"{path}.{os.getpid()}.tmp", 'w') as cache_file:
+            json.dump(data, cache_file, default=str)  # default=str covers botocore datetimes
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+    except OSError:
+        pass
+
+
+def drop_cache(name):
+    """Remove a cache entry that turned out to be stale"""
+    try:
+        os.remove(os.path.join(CACHE_DIR, name))
+    except OSError:
+        pass
+
+
+def clear_instance_cache():
+    """Forget cached describe_instances results after instances are created or terminated"""
+    try:
+        entries = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    
+    for entry in entries:
+        if entry.startswith('instances_'):
+            try:
+                os.remove(os.path.join(CACHE_DIR, entry))
+            except OSError:
+                pass
+
+
+def credentials_fingerprint():
+    """Short, non-reversible ID of the configured AWS credentials for per-account caches"""
+    return hashlib.sha256(os.getenv('AWS_ACCESS_KEY_ID', '').encode()).hexdigest()[:16]
+
+
+def cached_key_pairs(region):
+    """Return AWS key pair names confirmed to exist within the last day"""
+    cached = read_cache(f"keys_{region}.json", KEY_PAIR_CACHE_MAX_AGE)
+    if cached and cached.get('Credentials') == credentials_fingerprint():
+        return set(cached.get('KeyNames', []))
+    return set()
+
+
+def remember_key_pair(region, key_name, exists=True):
+    """Record whether an AWS key pair exists in the key pair cache"""
+    key_names = cached_key_pairs(region)
+    if exists:
+        key_names.add(key_name)
+    else:
+        key_names.discard(key_name)
+    write_cache(f"keys_{region}.json", {'Credentials': credentials_fingerprint(), 'KeyNames': sorted(key_names)})
+
+
+def have_key_file(path):
+    """Check that a key file exists and is non-empty with a single stat call"""
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
+
+
 def check_dependencies():
     """Check if required dependencies are installed and prompt user to install if missing"""
     missing_deps = []
     missing_display = []
-    missing_tools = []
     
-    # Check for boto3
-    try:
-        import boto3
-    except ImportError:
+    # Check for boto3 (locate only - importing it is slow)
+    if importlib.util.find_spec('boto3') is None:
         missing_deps.append('boto3')
         missing_display.append('boto3 (AWS SDK for Python)')
     
-    # Check for python-dotenv
-    try:
-        import dotenv
-    except ImportError:
-        missing_deps.append('python-dotenv')
-        missing_display.append('python-dotenv')
-    
-    # Check for AWS CLI
-    try:
-        subprocess.check_output(['aws', '--version'], stderr=subprocess.STDOUT)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        missing_deps.append('awscli')
-        missing_display.append('awscli (AWS Command Line Interface)')
-        missing_tools.append('AWS CLI')
-    
-    # Check for GitHub CLI
-    gh_missing = False
-    try:
-        subprocess.check_output(['gh', '--version'], stderr=subprocess.STDOUT)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        gh_missing = True
-        missing_tools.append('GitHub CLI')
+    # Check for cryptography (SSH key generation)
+    if importlib.util.find_spec('cryptography') is None:
+        missing_deps.append('cryptography')
+        missing_display.append('cryptography (SSH key generation)')
     
     if missing_deps:
         print("❌ Missing required dependencies:")
@@ -97,59 +179,66 @@ def check_dependencies():
         if response in ['y', 'yes', '']:
             try:
                 print("📥 Installing dependencies...")
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install'] + missing_deps)
+                # Wheels only, no pip self-update check (honours PIP_CACHE_DIR for a persistent cache)
+                subprocess.check_call([
+                    sys.executable, '-m', 'pip', 'install',
+                    '--prefer-binary', '--only-binary=:all:',
+                    '--disable-pip-version-check', '--no-input'
+                ] + missing_deps)
                 print("✅ Dependencies installed successfully!")
                 
                 # Try importing again to verify installation
                 try:
                     import boto3
-                    import dotenv
+                    import cryptography
                     print("✅ Python dependencies imported successfully")
                     
-                    # Check AWS CLI again
-                    try:
-                        subprocess.check_output(['aws', '--version'], stderr=subprocess.STDOUT)
-                        print("✅ AWS CLI is now available")
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        print("✅ AWS CLI installed but may need PATH refresh")
-                        
-                    # Check GitHub CLI again
-                    try:
-                        subprocess.check_output(['gh', '--version'], stderr=subprocess.STDOUT)
-                        print("✅ GitHub CLI is available")
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        print("💡 GitHub CLI not found - install with: brew install gh")
-                        
                 except ImportError as e:
                     print(f"❌ Failed to import dependencies after installation: {e}")
                     sys.exit(1)
                     
             except subprocess.CalledProcessError as e:
                 print(f"❌ Failed to install dependencies: {e}")
-                print("Please install manually using: pip install boto3 python-dotenv awscli")
+                print("Please install manually using: pip install boto3 cryptography")
                 sys.exit(1)
         else:
             print("Please install the required dependencies and run the script again.")
             sys.exit(1)
-    
-    # Handle GitHub CLI separately since it's not a pip package
-    if gh_missing:
-        print("\n❌ Missing required tool:")
-        print("   - GitHub CLI (gh)")
-        print("\n📦 To install GitHub CLI:")
-        print("   macOS: brew install gh")
-        print("   Linux: https://cli.github.com/")
-        print("   Windows: https://cli.github.com/")
-        
-        print("\n💡 GitHub CLI is required for repository management features")
-        sys.exit(1)
 
 # Check dependencies before importing AWS modules
 check_dependencies()
 
+
+def load_env(path):
+    """Load KEY=value lines from a .env file without overriding existing environment variables"""
+    try:
+        with open(path, 'r') as env_file:
+            lines = env_file.readlines()
+    except OSError:
+        return
+    
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('export '):
+            line = line[len('export '):]
+        
+        key, separator, value = line.partition('=')
+        if not separator:
+            continue
+        key = key.strip()
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        
+        if key and key not in os.environ:
+            os.environ[key] = value
+
+
 # Load environment variables from .env file
-from dotenv import load_dotenv
-load_dotenv(os.path.expanduser('~/.env'))
+load_env(os.path.expanduser('~/.env'))
+
 
 def check_aws_credentials():
     """Check if AWS credentials are available and guide user if missing"""
@@ -182,35 +271,83 @@ def check_aws_credentials():
         
         sys.exit(1)
 
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+
+@functools.lru_cache(maxsize=None)
+def get_ec2_client(region, profile=None):
+    """Get a shared EC2 client for the region and AWS profile (built once per process)"""
+    # boto3 is imported here rather than at module level so help/web/key stay fast
+    import boto3
+    from botocore.config import Config
+    
+    return boto3.session.Session(profile_name=profile).client(
+        'ec2',
+        region_name=region,
+        config=Config(
+            max_pool_connections=20,
+            tcp_keepalive=True,  # Reuse TLS connections across back-to-back calls
+            retries={'max_attempts': 5, 'mode': 'standard'},
+            connect_timeout=3,
+            read_timeout=30
+        )
+    )
+
+
+def purge_stale_cache():
+    """Delete cache files older than 30 days"""
+    try:
+        entries = os.listdir(CACHE_DIR)
+    except FileNotFoundError:
+        return
+    
+    cutoff = time.time() - CACHE_PURGE_AGE
+    for entry in entries:
+        path = os.path.join(CACHE_DIR, entry)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
 
 
 def get_latest_ubuntu_ami(ec2_client):
-    """Get the latest Ubuntu Server 24.04 LTS AMI ID"""
+    """Get the latest Ubuntu Server 24.04 LTS AMI ID (cached on disk for a week)"""
+    region = ec2_client.meta.region_name
+    cache_name = f"ami_{region}_{time.strftime('%Y_w%U')}.json"
+    
+    # Reuse this week's lookup if it is still fresh
+    image = read_cache(cache_name, AMI_CACHE_MAX_AGE)
+    if image and 'ImageId' in image and 'Name' in image:
+        return image['ImageId'], image['Name']
+    
+    ami_id, ami_name = find_latest_ubuntu_ami(ec2_client)
+    write_cache(cache_name, {'ImageId': ami_id, 'Name': ami_name})
+    
+    return ami_id, ami_name
+
+
+def find_latest_ubuntu_ami(ec2_client):
+    """Query EC2 for the latest Ubuntu Server 24.04 LTS AMI ID"""
+    from botocore.exceptions import ClientError
+    
     try:
-        # Try multiple common patterns for Ubuntu 24.04 LTS
-        patterns = [
-            'ubuntu/images/hvm-ssd-gp3/ubuntu-noble-24.04-amd64-server-*',
-            'ubuntu/images/hvm-ssd/ubuntu-noble-24.04-amd64-server-*',
-            'ubuntu/images/hvm-ssd/ubuntu-jammy-22.04-amd64-server-*'  # Fallback to 22.04 LTS
-        ]
+        # Only dated 24.04 gp3 server builds - keeps the result set to a few hundred rows
+        paginator = ec2_client.get_paginator('describe_images')
+        pages = paginator.paginate(
+            Owners=['099720109477'],  # Canonical's AWS account ID
+            Filters=[
+                {'Name': 'name', 'Values': ['ubuntu/images/hvm-ssd-gp3/ubuntu-noble-24.04-amd64-server-2*']},
+                {'Name': 'architecture', 'Values': ['x86_64']},
+                {'Name': 'virtualization-type', 'Values': ['hvm']},
+                {'Name': 'state', 'Values': ['available']}
+            ],
+            PaginationConfig={'PageSize': 100}
+        )
         
-        for pattern in patterns:
-            response = ec2_client.describe_images(
-                Owners=['099720109477'],  # Canonical's AWS account ID
-                Filters=[
-                    {'Name': 'name', 'Values': [pattern]},
-                    {'Name': 'architecture', 'Values': ['x86_64']},
-                    {'Name': 'virtualization-type', 'Values': ['hvm']},
-                    {'Name': 'state', 'Values': ['available']}
-                ]
-            )
-            
-            # Sort by creation date and get the latest
-            images = sorted(response['Images'], key=lambda x: x['CreationDate'], reverse=True)
-            if images:
-                return images[0]['ImageId'], images[0]['Name']
+        # Keep the newest image in a single O(n) pass instead of sorting every page
+        latest = max(pages.search('Images[]'), key=operator.itemgetter('CreationDate'), default=None)
+        
+        if latest:
+            return latest['ImageId'], latest['Name']
         
         raise Exception("No Ubuntu Server LTS AMI found")
             
@@ -218,8 +355,18 @@ def get_latest_ubuntu_ami(ec2_client):
         raise Exception(f"Error fetching AMI: {e}")
 
 
+def write_key_file(path, data, mode):
+    """Create a new key file with its final permissions in a single open call"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    with os.fdopen(fd, 'wb') as key_file:
+        key_file.write(data)
+
+
 def create_key_pair(ec2_client, key_name):
     """Create a new SSH key pair locally and import public key to AWS"""
+    from botocore.exceptions import ClientError
+    
+    created_files = []
     try:
         # Set up paths
         ssh_dir = os.path.expanduser('~/.ssh')
@@ -228,26 +375,37 @@ def create_key_pair(ec2_client, key_name):
         key_file_path = os.path.join(ssh_dir, f'{key_name}')
         pub_key_file_path = os.path.join(ssh_dir, f'{key_name}.pub')
         
-        # Generate SSH key pair locally using ssh-keygen
+        # Generate SSH key pair in-process (no ssh-keygen fork/exec)
         try:
+            from cryptography.hazmat.primitives import serialization
+            from cryptography.hazmat.primitives.asymmetric import rsa
+            
             # Generate RSA key pair (2048 bits for compatibility)
-            subprocess.run([
-                'ssh-keygen', '-t', 'rsa', '-b', '2048',
-                '-f', key_file_path,
-                '-N', '',  # No passphrase
-                '-C', f'{key_name}@aws-free-script'
-            ], check=True, capture_output=True)
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            private_key_material = private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.OpenSSH,  # Same format ssh-keygen writes
+                serialization.NoEncryption()  # No passphrase
+            )
+            public_key_material = private_key.public_key().public_bytes(
+                serialization.Encoding.OpenSSH,
+                serialization.PublicFormat.OpenSSH
+            ).decode() + f' {key_name}@aws-free-script'
+            
+            # Private key is read-only for owner, public key is world-readable
+            write_key_file(key_file_path, private_key_material, 0o600)
+            created_files.append(key_file_path)
+            write_key_file(pub_key_file_path, (public_key_material + '\n').encode(), 0o644)
+            created_files.append(pub_key_file_path)
             
             print(f"✅ Generated SSH key pair locally")
             print(f"   Private key: {key_file_path}")
             print(f"   Public key: {pub_key_file_path}")
             
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            raise Exception(f"Failed to generate SSH key pair. Please install ssh-keygen: {e}")
-        
-        # Read the public key
-        with open(pub_key_file_path, 'r') as pub_file:
-            public_key_material = pub_file.read().strip()
+        except FileExistsError as e:
+            raise Exception(f"Key file already exists, refusing to overwrite: {e.filename}")
+        except ImportError as e:
+            raise Exception(f"Failed to generate SSH key pair. Please install cryptography: {e}")
         
         # Import public key to AWS
         try:
@@ -264,30 +422,54 @@ def create_key_pair(ec2_client, key_name):
             else:
                 raise Exception(f"Failed to import key pair to AWS: {e}")
         
-        # Set proper permissions (read-only for owner)
-        os.chmod(key_file_path, 0o600)
-        os.chmod(pub_key_file_path, 0o644)
+        remember_key_pair(ec2_client.meta.region_name, key_name)
         
         return key_name
         
     except Exception as e:
-        # Clean up partial files if creation failed
-        for path in [key_file_path, pub_key_file_path]:
-            if 'path' in locals() and os.path.exists(path):
+        # Clean up partial files if creation failed (never touch pre-existing keys)
+        for path in created_files:
+            if os.path.exists(path):
                 os.remove(path)
         raise e
 
 
 def create_security_group(ec2_client):
     """Create a basic security group allowing SSH access"""
+    from botocore.exceptions import ClientError
+    
+    region = ec2_client.meta.region_name
+    cache_name = f"sg_{region}.json"
+    # Security group IDs are per account, so tie the cache to the credentials in use
+    credentials_id = credentials_fingerprint()
+    
     try:
+        # Reuse the cached group ID; revalidate it against AWS at most once a day
+        cached = read_cache(cache_name)
+        if cached and cached.get('GroupId') and cached.get('Credentials') == credentials_id:
+            security_group_id = cached['GroupId']
+            if time.time() - cached.get('ValidatedAt', 0) < SG_REVALIDATE_AGE:
+                print(f"Using existing security group: {security_group_id}")
+                return security_group_id
+            
+            try:
+                ec2_client.describe_security_groups(GroupIds=[security_group_id])
+                write_cache(cache_name, dict(cached, ValidatedAt=time.time()))
+                print(f"Using existing security group: {security_group_id}")
+                return security_group_id
+            except ClientError as e:
+                if 'InvalidGroup' not in str(e):
+                    raise
+        
         # Check if security group already exists
         try:
             response = ec2_client.describe_security_groups(
                 GroupNames=['ec2-free-tier-sg']
             )
-            print(f"Using existing security group: {response['SecurityGroups'][0]['GroupId']}")
-            return response['SecurityGroups'][0]['GroupId']
+            security_group_id = response['SecurityGroups'][0]['GroupId']
+            write_cache(cache_name, {'GroupId': security_group_id, 'Credentials': credentials_id, 'ValidatedAt': time.time()})
+            print(f"Using existing security group: {security_group_id}")
+            return security_group_id
         except ClientError as e:
             if 'InvalidGroup.NotFound' not in str(e):
                 raise
@@ -313,6 +495,7 @@ def create_security_group(ec2_client):
             ]
         )
         
+        write_cache(cache_name, {'GroupId': security_group_id, 'Credentials': credentials_id, 'ValidatedAt': time.time()})
         print(f"Created security group: {security_group_id}")
         return security_group_id
         
@@ -320,45 +503,71 @@ def create_security_group(ec2_client):
         raise Exception(f"Error creating security group: {e}")
 
 
-def list_instances(region='us-west-2'):
+def find_instances(ec2_client, filters):
+    """Return every instance matching the filters, following pagination"""
+    paginator = ec2_client.get_paginator('describe_instances')
+    return list(paginator.paginate(Filters=filters).search('Reservations[].Instances[]'))
+
+
+def cached_find_instances(ec2_client, filters, ttl=INSTANCE_CACHE_MAX_AGE, refresh=False):
+    """find_instances() backed by a short-lived on-disk cache keyed by region, credentials and filters"""
+    key = json.dumps([ec2_client.meta.region_name, credentials_fingerprint(), filters], sort_keys=True)
+    cache_name = f"instances_{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.json"
+    
+    if not refresh:
+        instances = read_cache(cache_name, ttl)
+        if instances is not None:
+            return instances
+    
+    instances = find_instances(ec2_client, filters)
+    write_cache(cache_name, instances)
+    return instances
+
+
+def instance_name(instance):
+    """Return the instance's Name tag, or 'N/A' if it has none"""
+    return next((tag['Value'] for tag in instance.get('Tags', ()) if tag['Key'] == 'Name'), 'N/A')
+
+
+def is_managed_instance(instance):
+    """Return True for free tier instances launched by this script (tagged CreatedBy at launch)"""
+    return (
+        instance['InstanceType'] == 't3.micro'
+        and any(tag['Key'] == 'CreatedBy' and tag['Value'] == 'aws-free-script' for tag in instance.get('Tags', ()))
+    )
+
+
+def format_instances(instances):
+    """Format instances as the table shown by list, ssh, delete and create"""
+    rows = [
+        f"{'Instance ID':<20} {'Type':<12} {'State':<12} {'Public IP':<15} {'Name':<20}",
+        "=" * 85
+    ]
+    
+    for instance in instances:
+        rows.append(
+            f"{instance['InstanceId']:<20} {instance['InstanceType']:<12} {instance['State']['Name']:<12} "
+            f"{instance.get('PublicIpAddress', 'N/A'):<15} {instance_name(instance):<20}"
+        )
+    
+    return '\n'.join(rows) + '\n'
+
+
+def list_instances(region='us-west-2', use_cache=True):
     """List all EC2 instances"""
+    from botocore.exceptions import ClientError
+    
     try:
-        ec2_client = boto3.client('ec2', region_name=region)
-        
-        response = ec2_client.describe_instances(
-            Filters=[
-                {'Name': 'instance-state-name', 'Values': ['pending', 'running', 'stopping', 'stopped']}
-            ]
-        )
+        ec2_client = get_ec2_client(region)
         
-        instances = []
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                instances.append(instance)
+        instances = cached_find_instances(ec2_client, ACTIVE_FILTER, refresh=not use_cache)
         
         if not instances:
             print(f"\nNo running instances found in region {region}")
             print()
             return
         
-        print(f"{'Instance ID':<20} {'Type':<12} {'State':<12} {'Public IP':<15} {'Name':<20}")
-        print("=" * 85)
-        
-        for instance in instances:
-            instance_id = instance['InstanceId']
-            instance_type = instance['InstanceType']
-            state = instance['State']['Name']
-            public_ip = instance.get('PublicIpAddress', 'N/A')
-            
-            # Get Name tag
-            name = 'N/A'
-            for tag in instance.get('Tags', []):
-                if tag['Key'] == 'Name':
-                    name = tag['Value']
-                    break
-            
-            print(f"{instance_id:<20} {instance_type:<12} {state:<12} {public_ip:<15} {name:<20}")
-        
+        sys.stdout.write(format_instances(instances))
         print()
     
     except ClientError as e:
@@ -371,21 +580,14 @@ def list_instances(region='us-west-2'):
 
 def ssh_to_instance(instance_id=None, region='us-west-2'):
     """SSH to an instance, with option to create key pair if needed"""
+    from botocore.exceptions import ClientError
+    
     try:
-        ec2_client = boto3.client('ec2', region_name=region)
+        ec2_client = get_ec2_client(region)
         
         # If no instance ID provided, find the running instance automatically
         if not instance_id:
-            response = ec2_client.describe_instances(
-                Filters=[
-                    {'Name': 'instance-state-name', 'Values': ['running']}
-                ]
-            )
-            
-            running_instances = []
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    running_instances.append(instance)
+            running_instances = find_instances(ec2_client, RUNNING_FILTER)
             
             if not running_instances:
                 print("\nNo running instances found in region", region)
@@ -393,24 +595,7 @@ def ssh_to_instance(instance_id=None, region='us-west-2'):
                 return
             
             # Show the running instance in same format as list command
-            print(f"{'Instance ID':<20} {'Type':<12} {'State':<12} {'Public IP':<15} {'Name':<20}")
-            print("=" * 85)
-            
-            for instance in running_instances:
-                instance_id = instance['InstanceId']
-                instance_type = instance['InstanceType']
-                state = instance['State']['Name']
-                public_ip = instance.get('PublicIpAddress', 'N/A')
-                
-                # Get Name tag
-                name = 'N/A'
-                for tag in instance.get('Tags', []):
-                    if tag['Key'] == 'Name':
-                        name = tag['Value']
-                        break
-                
-                print(f"{instance_id:<20} {instance_type:<12} {state:<12} {public_ip:<15} {name:<20}")
-            
+            sys.stdout.write(format_instances(running_instances))
             print()
             
             # Use the first (and only) instance
@@ -448,7 +633,7 @@ def ssh_to_instance(instance_id=None, region='us-west-2'):
         
         # Check if key file exists locally
         key_file_path = os.path.expanduser(f'~/.ssh/{key_name}')
-        if not os.path.exists(key_file_path):
+        if not have_key_file(key_file_path):
             print(f"⚠️  Key file not found: {key_file_path}")
             print("You may need to:")
             print(f"1. Download the {key_name} file from AWS Console")
@@ -461,14 +646,22 @@ def ssh_to_instance(instance_id=None, region='us-west-2'):
         print(f"\n🔗 SSH Command:")
         print(f"{ssh_command}")
         
-        try:
-            print("\n🚀 Opening SSH connection...")
-            subprocess.run(['ssh', '-i', key_file_path, f'ubuntu@{public_ip}'])
-        except KeyboardInterrupt:
-            print("\nSSH connection interrupted")
-        except FileNotFoundError:
+        if shutil.which('ssh') is None:
             print("SSH command not found. Please install SSH client.")
-        except Exception as e:
+            return
+        
+        print("\n🚀 Opening SSH connection...")
+        sys.stdout.flush()
+        
+        ssh_args = ['ssh', '-i', key_file_path, f'ubuntu@{public_ip}']
+        try:
+            if sys.platform == 'win32':
+                # Windows has no real exec - execvp would return to the shell while ssh still runs
+                subprocess.run(ssh_args)
+            else:
+                # Replace this process with ssh so the interpreter doesn't sit in memory for the session
+                os.execvp('ssh', ssh_args)
+        except OSError as e:
             print(f"Error executing SSH: {e}")
         
     except ClientError as e:
@@ -482,6 +675,26 @@ def ssh_to_instance(instance_id=None, region='us-west-2'):
         sys.exit(1)
 
 
+def open_url(url):
+    """Open a URL in the default browser without waiting for the launcher"""
+    if sys.platform == 'win32':
+        os.startfile(url)
+        return
+    
+    launcher = 'open' if sys.platform == 'darwin' else 'xdg-open'
+    if shutil.which(launcher) is None:
+        # No desktop launcher available - let webbrowser pick one
+        webbrowser.open(url)
+        return
+    
+    subprocess.Popen(
+        [launcher, url],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
 def open_console(region='us-west-2'):
     """Open AWS EC2 console in browser"""
     console_url = f"https://{region}.console.aws.amazon.com/ec2/home?region={region}#Instances:instanceState=running"
@@ -490,7 +703,7 @@ def open_console(region='us-west-2'):
     print(f"URL: {console_url}")
     
     try:
-        webbrowser.open(console_url)
+        open_url(console_url)
         print("✅ Console opened in your default browser")
         print()
     except Exception as e:
@@ -508,7 +721,7 @@ def open_key_pairs(region='us-west-2'):
     print(f"URL: {key_pairs_url}")
     
     try:
-        webbrowser.open(key_pairs_url)
+        open_url(key_pairs_url)
         print("✅ Key Pairs console opened in your default browser")
         print()
     except Exception as e:
@@ -519,10 +732,12 @@ def open_key_pairs(region='us-west-2'):
 
 
 
-def delete_instance(instance_id, region='us-west-2'):
+def delete_instance(instance_id, region='us-west-2', assume_yes=False):
     """Delete (terminate) an EC2 instance"""
+    from botocore.exceptions import ClientError
+    
     try:
-        ec2_client = boto3.client('ec2', region_name=region)
+        ec2_client = get_ec2_client(region)
         
         # Get instance details first
         try:
@@ -537,20 +752,9 @@ def delete_instance(instance_id, region='us-west-2'):
                 print("They will disappear from the AWS console within ~1 hour after termination.")
                 return
             
-            # Get Name tag
-            name = 'N/A'
-            for tag in instance.get('Tags', []):
-                if tag['Key'] == 'Name':
-                    name = tag['Value']
-                    break
-            
             print(f"Instance details:")
             print()
-            print(f"{'Instance ID':<20} {'Type':<12} {'State':<12} {'Public IP':<15} {'Name':<20}")
-            print("=" * 85)
-            
-            public_ip = instance.get('PublicIpAddress', 'N/A')
-            print(f"{instance_id:<20} {instance['InstanceType']:<12} {state:<12} {public_ip:<15} {name:<20}")
+            sys.stdout.write(format_instances([instance]))
             print()
             
         except ClientError as e:
@@ -559,8 +763,15 @@ def delete_instance(instance_id, region='us-west-2'):
                 return
             raise
         
-        # Confirm deletion
-        confirm = input(f"⚠️  Are you sure you want to delete (terminate) instance {instance_id}? (Y/n): ").strip().lower()
+        # Confirm deletion - there is nobody to answer the prompt when stdin is not a terminal
+        if assume_yes:
+            confirm = 'y'
+        elif not sys.stdin.isatty():
+            print("Re-run with --yes to confirm deletion non-interactively")
+            print()
+            sys.exit(1)
+        else:
+            confirm = input(f"⚠️  Are you sure you want to delete (terminate) instance {instance_id}? (Y/n): ").strip().lower()
         
         if confirm in ['n', 'no']:
             print("Deletion cancelled")
@@ -569,6 +780,7 @@ def delete_instance(instance_id, region='us-west-2'):
         # Terminate instance
         print("Terminating instance...")
         ec2_client.terminate_instances(InstanceIds=[instance_id])
+        clear_instance_cache()
         
         print(f"✅ Instance {instance_id} termination initiated")
         print("Note: It may take a few minutes for the instance to fully terminate")
@@ -584,48 +796,27 @@ def delete_instance(instance_id, region='us-west-2'):
 
 def launch_instance(region='us-west-2', key_name=None):
     """Launch a free tier EC2 instance"""
+    from concurrent.futures import ThreadPoolExecutor
+    from botocore.exceptions import ClientError, NoCredentialsError
+    
     try:
         # Create EC2 client
-        ec2_client = boto3.client('ec2', region_name=region)
+        ec2_client = get_ec2_client(region)
         
         # Check if there's already a free tier instance running
         print("Checking existing instances...")
-        response = ec2_client.describe_instances(
-            Filters=[
-                {'Name': 'instance-type', 'Values': ['t3.micro']},
-                {'Name': 'instance-state-name', 'Values': ['pending', 'running', 'stopping', 'stopped']}
-            ]
-        )
-        
-        existing_instances = []
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                existing_instances.append(instance)
+        existing_instances = find_instances(ec2_client, FREE_TIER_FILTER)
         
         if existing_instances:
             print("❌ Free tier limit reached!")
             print("You already have the following free tier instance(s):")
             print()
-            print(f"{'Instance ID':<20} {'Type':<12} {'State':<12} {'Public IP':<15} {'Name':<20}")
-            print("=" * 85)
-            
-            for instance in existing_instances:
-                instance_id = instance['InstanceId']
-                instance_type = instance['InstanceType']
-                state = instance['State']['Name']
-                public_ip = instance.get('PublicIpAddress', 'N/A')
-                
-                # Get Name tag
-                name = 'N/A'
-                for tag in instance.get('Tags', []):
-                    if tag['Key'] == 'Name':
-                        name = tag['Value']
-                        break
-                
-                print(f"{instance_id:<20} {instance_type:<12} {state:<12} {public_ip:<15} {name:<20}")
+            sys.stdout.write(format_instances(existing_instances))
             
             print(f"\n💡 AWS Free Tier allows only ONE free tier instance at a time.")
-            print("To create a new instance, you must first delete (terminate) the existing one.")
+            print("To create a new instance, you must first delete (terminate) the existing one:")
+            for instance in existing_instances:
+                print(f"   python aws-free.py delete --instance-id {instance['InstanceId']}")
             print()
             
             return None
@@ -637,18 +828,24 @@ def launch_instance(region='us-west-2', key_name=None):
             public_key_path = os.path.expanduser('~/.ssh/aws_ec2_free.pub')
             
             # Check if local keys exist and if AWS key pair exists
-            local_keys_exist = os.path.exists(private_key_path) and os.path.exists(public_key_path)
+            local_keys_exist = have_key_file(private_key_path) and have_key_file(public_key_path)
             aws_key_exists = False
             
-            try:
-                ec2_client.describe_key_pairs(KeyNames=[key_name])
+            if local_keys_exist and key_name in cached_key_pairs(region):
+                # Confirmed within the last day - skip the DescribeKeyPairs round-trip
                 aws_key_exists = True
                 print(f"🔍 Found existing AWS key pair: {key_name}")
-            except ClientError as e:
-                if 'InvalidKeyPair.NotFound' in str(e):
-                    print(f"🔍 AWS key pair '{key_name}' not found")
-                else:
-                    print(f"⚠️  Error checking AWS key pair: {e}")
+            else:
+                try:
+                    ec2_client.describe_key_pairs(KeyNames=[key_name])
+                    aws_key_exists = True
+                    remember_key_pair(region, key_name)
+                    print(f"🔍 Found existing AWS key pair: {key_name}")
+                except ClientError as e:
+                    if 'InvalidKeyPair.NotFound' in str(e):
+                        print(f"🔍 AWS key pair '{key_name}' not found")
+                    else:
+                        print(f"⚠️  Error checking AWS key pair: {e}")
             
             # Determine what to do based on key states
             if local_keys_exist and aws_key_exists:
@@ -664,6 +861,7 @@ def launch_instance(region='us-west-2', key_name=None):
                         KeyName=key_name,
                         PublicKeyMaterial=public_key_material
                     )
+                    remember_key_pair(region, key_name)
                     print(f"✅ Re-imported public key to AWS as: {key_name}")
                 except Exception as e:
                     print(f"⚠️  Failed to import existing key to AWS: {e}")
@@ -677,6 +875,7 @@ def launch_instance(region='us-west-2', key_name=None):
                     if aws_key_exists:
                         try:
                             ec2_client.delete_key_pair(KeyName=key_name)
+                            remember_key_pair(region, key_name, exists=False)
                             print(f"🗑️  Removed old AWS key pair: {key_name}")
                         except Exception as e:
                             print(f"⚠️  Could not remove old AWS key: {e}")
@@ -698,16 +897,19 @@ def launch_instance(region='us-west-2', key_name=None):
                     print("Continuing without key pair - SSH access won't be available")
                     key_name = None
 
-        # Get latest Ubuntu Server 24.04 LTS AMI
+        # Resolve the AMI and security group concurrently - they are independent
+        # round-trips and the shared client is thread-safe
         print("\nFinding latest Ubuntu Server 24.04 LTS AMI...")
-        ami_id, ami_name = get_latest_ubuntu_ami(ec2_client)
+        print("Setting up security group...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ami_future = executor.submit(get_latest_ubuntu_ami, ec2_client)
+            security_group_future = executor.submit(create_security_group, ec2_client)
+            ami_id, ami_name = ami_future.result()
+            security_group_id = security_group_future.result()
+        
         print(f"Using AMI: {ami_id}")
         print(f"AMI Name: {ami_name}")
         
-        # Create security group
-        print("Setting up security group...")
-        security_group_id = create_security_group(ec2_client)
-        
         # Instance configuration
         instance_config = {
             'ImageId': ami_id,
@@ -737,9 +939,41 @@ def launch_instance(region='us-west-2', key_name=None):
         
         # Launch instance
         print("Launching EC2 instance...")
-        response = ec2_client.run_instances(**instance_config)
+        # The key pair and security group may come from local caches; if either was deleted
+        # in AWS, repair whichever one run_instances rejects and retry (at most once each)
+        repaired = set()
+        while True:
+            try:
+                response = ec2_client.run_instances(**instance_config)
+                break
+            except ClientError as e:
+                if 'InvalidGroup.NotFound' in str(e) and 'group' not in repaired:
+                    repaired.add('group')
+                    drop_cache(f"sg_{region}.json")
+                    print("🔄 Cached security group no longer exists. Setting it up again...")
+                    instance_config['SecurityGroupIds'] = [create_security_group(ec2_client)]
+                elif 'InvalidKeyPair.NotFound' in str(e) and key_name and 'key' not in repaired:
+                    repaired.add('key')
+                    remember_key_pair(region, key_name, exists=False)
+                    public_key_path = os.path.expanduser(f'~/.ssh/{key_name}.pub')
+                    if not have_key_file(public_key_path):
+                        raise
+                    
+                    print(f"🔄 AWS key pair '{key_name}' is missing. Re-importing local public key...")
+                    with open(public_key_path, 'r') as pub_file:
+                        public_key_material = pub_file.read().strip()
+                    ec2_client.import_key_pair(
+                        KeyName=key_name,
+                        PublicKeyMaterial=public_key_material
+                    )
+                    remember_key_pair(region, key_name)
+                    print(f"✅ Re-imported public key to AWS as: {key_name}")
+                else:
+                    raise
+        clear_instance_cache()
         
-        instance_id = response['Instances'][0]['InstanceId']
+        instance = response['Instances'][0]
+        instance_id = instance['InstanceId']
         print(f"Instance launched successfully!")
         print(f"Instance ID: {instance_id}")
         print(f"Region: {region}")
@@ -747,11 +981,16 @@ def launch_instance(region='us-west-2', key_name=None):
         # Wait for instance to be running
         print("Waiting for instance to be running...")
         waiter = ec2_client.get_waiter('instance_running')
-        waiter.wait(InstanceIds=[instance_id])
+        # Poll every 5s (default is 15s) - t3.micro usually boots in under a minute
+        waiter.wait(InstanceIds=[instance_id], WaiterConfig={'Delay': 5, 'MaxAttempts': 60})
         
-        # Get instance details
-        response = ec2_client.describe_instances(InstanceIds=[instance_id])
-        instance = response['Reservations'][0]['Instances'][0]
+        # run_instances already reports type, private IP and launch time;
+        # only refresh when the public IP wasn't assigned yet at launch
+        if instance.get('PublicIpAddress'):
+            instance['State'] = {'Name': 'running'}
+        else:
+            response = ec2_client.describe_instances(InstanceIds=[instance_id])
+            instance = response['Reservations'][0]['Instances'][0]
         
         print("\n=== Instance Details ===")
         print(f"Instance ID: {instance['InstanceId']}")
@@ -780,191 +1019,217 @@ def launch_instance(region='us-west-2', key_name=None):
         sys.exit(1)
 
 
-def main():
-    """Main function"""
-    print("AWS EC2 Free Tier Instance Manager")
-    print("===================================")
+# Shown on every run - written in one go rather than line by line
+DEFAULT_SETTINGS = """\
+Default Settings:
+  AWS Region: us-west-2
+  Instance Name: free-tier
+  Instance Type: t3.micro (2 vCPU, 1 GB Memory) - Free tier eligible
+  AMI Image: Ubuntu Server 24.04 LTS (resolved at launch time)
+  Operating System: Ubuntu Server 24.04 LTS (amd64)
+  SSH User: ubuntu
+
+"""
+
+CREATE_SUCCESS = (
+    "\n✅ Free tier EC2 instance created successfully!\n"
+    "Remember: You get 750 hours per month of free tier usage for free.\n"
+    "Don't forget to stop/terminate the instance when not in use to avoid charges.\n"
+    "\n"
+)
+
+
+def build_parser():
+    """Build the command-line parser with one subcommand per command"""
+    parser = argparse.ArgumentParser(
+        prog='aws-free.py',
+        description='AWS EC2 Free Tier Instance Manager',
+        epilog='Note: All instances will be free tier eligible\n'
+               '      Key pairs created locally and synchronized with AWS',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest='command', title='commands', metavar='command')
     
-    # Check AWS credentials first
-    check_aws_credentials()
+    list_parser = subparsers.add_parser('list', help='List running instances')
+    list_parser.add_argument('--no-cache', action='store_true', help='Ignore instance results cached in the last minute')
     
-    # Get the actual AMI name for display
-    try:
-        import boto3
-        ec2_client = boto3.client('ec2', region_name='us-west-2')
-        _, ami_name = get_latest_ubuntu_ami(ec2_client)
-        actual_image = ami_name
-    except:
-        # Fallback if we can't get the actual AMI
-        actual_image = "ubuntu/images/hvm-ssd-gp3/ubuntu-noble-24.04-amd64-server (latest)"
-    
-    print("Default Settings:")
-    print("  AWS Region: us-west-2")
-    print("  Instance Name: free-tier")
-    print("  Instance Type: t3.micro (2 vCPU, 1 GB Memory) - Free tier eligible")
-    print(f"  AMI Image: {actual_image}")
-    print("  Operating System: Ubuntu Server 24.04 LTS (amd64)")
-    print("  SSH User: ubuntu")
+    create_parser = subparsers.add_parser('create', help='Create free-tier instance')
+    create_parser.add_argument('key_name', nargs='?', help='Existing key pair to use (default: aws_ec2_free)')
+    
+    delete_parser = subparsers.add_parser('delete', help='Delete free-tier instance')
+    delete_parser.add_argument('--no-cache', action='store_true', help='Ignore instance results cached in the last minute')
+    delete_target = delete_parser.add_mutually_exclusive_group()
+    delete_target.add_argument('--instance-id', help='Delete this instance without searching for candidates')
+    delete_target.add_argument('--index', type=int, help='Delete the Nth instance from the candidate list (1-based)')
+    delete_parser.add_argument('--yes', action='store_true', help='Skip the deletion confirmation prompt')
+    
+    ssh_parser = subparsers.add_parser('ssh', help='SSH to free-tier instance')
+    ssh_parser.add_argument('instance_id', nargs='?', help='Instance to connect to (default: the running one)')
+    
+    subparsers.add_parser('key', help='Open AWS Key Pairs console')
+    subparsers.add_parser('web', aliases=['console', 'dashboard', 'instances'], help='Open AWS Web Console')
+    subparsers.add_parser('help', help='Show this help')
+    
+    return parser
+
+
+def do_help(region, args):
+    """Handle the help command"""
+    build_parser().print_help()
+
+
+def do_list(region, args):
+    """Handle the list command"""
+    list_instances(region, use_cache=not args.no_cache)
+
+
+def do_delete(region, args):
+    """Handle the delete command - find the free tier instance and delete it"""
     print()
     
-    # Default configuration
-    region = 'us-west-2'  # Free tier is available in all regions
+    # Explicit instance - no need to search for candidates at all
+    if args.instance_id:
+        delete_instance(args.instance_id, region, args.yes)
+        return
     
-    # Command line argument parsing
-    if len(sys.argv) > 1:
-        # Check for multiple commands (invalid usage)
-        commands = ['list', 'create', 'delete', 'ssh', 'key', 'web', 'instances', 'console', 'dashboard', 'help', '-h', '--help']
-        provided_commands = [arg for arg in sys.argv[1:] if arg.lower() in commands]
-        
-        if len(provided_commands) > 1:
-            # Show help for invalid usage
-            print("\nUsage:")
-            print("  python aws-free.py [command]")
-            print("\nCommands:")
-            print("  list      # List running instances")
-            print("  create    # Create free-tier instance")
-            print("  delete    # Delete free-tier instance")
-            print("  ssh       # SSH to free-tier instance")
-            print("  key       # Open AWS Key Pairs console")
-            print("  web       # Open AWS Web Console")
-            print("  help      # Show this help")
-            print("\nNote: All instances will be free tier eligible")
-            print("      Key pair created during instance creation")
-            print()
-            return
-        
-        command = sys.argv[1].lower()
-        
-        if command in ['-h', '--help', 'help']:
-            print("\nUsage:")
-            print("  python aws-free.py [command]")
-            print("\nCommands:")
-            print("  list      # List running instances")
-            print("  create    # Create a new instance (default)")
-            print("  delete    # Delete free-tier instance")
-            print("  ssh       # SSH to free-tier instance")
-            print("  key       # Open AWS Key Pairs console")
-            print("  web       # Open AWS Web Console")
-            print("  help      # Show this help")
-            print("\nNote: All instances will be free tier eligible")
-            print("      Key pair created during instance creation")
-            return
-        
-        elif command == 'list':
-            list_instances(region)
-            return
+    try:
+        ec2_client = get_ec2_client(region)
+        # Reuse the ACTIVE_FILTER result cached by list and narrow it down locally
+        instances = [
+            instance for instance in cached_find_instances(ec2_client, ACTIVE_FILTER, refresh=args.no_cache)
+            if is_managed_instance(instance)
+        ]
         
-        elif command == 'delete':
-            # Find the single running instance to delete
+        if not instances:
+            print("No free tier instances created by this script found to delete")
+            print("💡 To delete another t3.micro instance, run: python aws-free.py delete --instance-id <id>")
             print()
-            try:
-                ec2_client = boto3.client('ec2', region_name=region)
-                response = ec2_client.describe_instances(
-                    Filters=[
-                        {'Name': 'instance-type', 'Values': ['t3.micro']},
-                        {'Name': 'instance-state-name', 'Values': ['pending', 'running', 'stopping', 'stopped']}
-                    ]
-                )
-                
-                instances = []
-                for reservation in response['Reservations']:
-                    for instance in reservation['Instances']:
-                        instances.append(instance)
-                
-                if not instances:
-                    print("No free tier instances found to delete")
-                    print()
-                    return
-                
-                if len(instances) == 1:
-                    instance_id = instances[0]['InstanceId']
-                    delete_instance(instance_id, region)
-                else:
-                    print("Multiple instances found. Please specify which one to delete:")
-                    for i, instance in enumerate(instances, 1):
-                        name = 'N/A'
-                        for tag in instance.get('Tags', []):
-                            if tag['Key'] == 'Name':
-                                name = tag['Value']
-                                break
-                        print(f"{i}. {instance['InstanceId']} - {name} ({instance['State']['Name']})")
-                    
-                    try:
-                        choice = int(input(f"\nSelect instance to delete (1-{len(instances)}): ")) - 1
-                        if 0 <= choice < len(instances):
-                            instance_id = instances[choice]['InstanceId']
-                            delete_instance(instance_id, region)
-                        else:
-                            print("Invalid choice")
-                            return
-                    except ValueError:
-                        print("Invalid choice")
-                        return
-                        
-            except Exception as e:
-                print(f"Error finding instance: {e}")
-                sys.exit(1)
-            return
-        
-        elif command == 'ssh':
-            instance_id = None
-            if len(sys.argv) > 2:
-                instance_id = sys.argv[2]
-            ssh_to_instance(instance_id, region)
-            return
-        
-        elif command == 'key':
-            open_key_pairs(region)
             return
         
-        elif command in ['dashboard', 'console', 'instances', 'web']:
-            open_console(region)
+        if args.index is not None:
+            if 1 <= args.index <= len(instances):
+                delete_instance(instances[args.index - 1]['InstanceId'], region, args.yes)
+            else:
+                print(f"Invalid index {args.index} - choose 1-{len(instances)}")
+                sys.exit(1)
             return
         
-        elif command == 'create':
-            key_name = None
-            if len(sys.argv) > 2:
-                key_name = sys.argv[2]
-            
-            # Launch instance
-            instance_id = launch_instance(region=region, key_name=key_name)
+        if len(instances) == 1:
+            instance_id = instances[0]['InstanceId']
+            delete_instance(instance_id, region, args.yes)
+        else:
+            print("Multiple instances found. Please specify which one to delete:")
+            for i, instance in enumerate(instances, 1):
+                print(f"{i}. {instance['InstanceId']} - {instance_name(instance)} ({instance['State']['Name']})")
             
-            if instance_id:
-                print(f"\n✅ Free tier EC2 instance created successfully!")
-                print(f"Remember: You get 750 hours per month of free tier usage for free.")
-                print(f"Don't forget to stop/terminate the instance when not in use to avoid charges.")
+            # Don't block scripts waiting for a choice nobody can type
+            if not sys.stdin.isatty():
+                print("\nRe-run with --index N or --instance-id ID to choose one")
                 print()
-            return
-        
-        else:
-            # Backward compatibility - treat first arg as key_name for create
-            key_name = sys.argv[1]
+                sys.exit(1)
             
-            # Launch instance (backward compatibility)
-            instance_id = launch_instance(region=region, key_name=key_name)
+            # Line editing for the prompt where available (not on Windows)
+            try:
+                import readline
+            except ImportError:
+                pass
             
-            if instance_id:
-                print(f"\n✅ Free tier EC2 instance created successfully!")
-                print(f"Remember: You get 750 hours per month of free tier usage for free.")
-                print(f"Don't forget to stop/terminate the instance when not in use to avoid charges.")
-                print()
-            return
-    else:
-        # No arguments - show help
-        print("\nUsage:")
-        print("  python aws-free.py [command]")
-        print("\nCommands:")
-        print("  list      # List running instances")
-        print("  create    # Create free-tier instance")
-        print("  delete    # Delete free-tier instance")
-        print("  ssh       # SSH to free-tier instance")
-        print("  key       # Open AWS Key Pairs console")
-        print("  web       # Open AWS Web Console")
-        print("  help      # Show this help")
-        print("\nNote: All instances will be free tier eligible")
-        print("      Key pairs created locally and synchronized with AWS")
-        print()
+            # Give a few attempts so a typo doesn't mean re-running the whole command
+            for _ in range(3):
+                try:
+                    choice = int(input(f"\nSelect instance to delete (1-{len(instances)}): ")) - 1
+                except ValueError:
+                    print("Invalid choice, try again")
+                    continue
+                if 0 <= choice < len(instances):
+                    break
+                print(f"Out of range, choose 1-{len(instances)}")
+            else:
+                print("Invalid choice")
+                sys.exit(1)
+            
+            instance_id = instances[choice]['InstanceId']
+            delete_instance(instance_id, region, args.yes)
+                
+    except Exception as e:
+        print(f"Error finding instance: {e}")
+        sys.exit(1)
+
+
+def do_ssh(region, args):
+    """Handle the ssh command, with an optional instance ID"""
+    ssh_to_instance(args.instance_id, region)
+
+
+def do_key(region, args):
+    """Handle the key command"""
+    open_key_pairs(region)
+
+
+def do_console(region, args):
+    """Handle the web command (and its legacy console/dashboard/instances aliases)"""
+    open_console(region)
+
+
+def do_create(region, args):
+    """Handle the create command, with an optional key pair name"""
+    # Launch instance
+    instance_id = launch_instance(region=region, key_name=args.key_name)
+    
+    if instance_id:
+        sys.stdout.write(CREATE_SUCCESS)
+
+
+# Command name (and aliases) -> handler
+COMMANDS = {
+    name: handler
+    for names, handler in [
+        (('list',), do_list),
+        (('delete',), do_delete),
+        (('ssh',), do_ssh),
+        (('key',), do_key),
+        (('web', 'console', 'dashboard', 'instances'), do_console),
+        (('create',), do_create),
+        (('help',), do_help)
+    ]
+    for name in names
+}
+
+
+def main():
+    """Main function"""
+    print("AWS EC2 Free Tier Instance Manager")
+    print("===================================")
+    
+    # Check AWS credentials first
+    check_aws_credentials()
+    
+    # Drop cached lookups that are too old to be useful
+    purge_stale_cache()
+    
+    sys.stdout.write(DEFAULT_SETTINGS)
+    
+    # Default configuration
+    region = 'us-west-2'  # Free tier is available in all regions
+    
+    parser = build_parser()
+    argv = sys.argv[1:]
+    command = argv[0].lower() if argv else None
+    if command in COMMANDS:
+        argv[0] = command
+    elif command and not command.startswith('-'):
+        # Backward compatibility - treat first arg as key_name for create
+        argv = ['create'] + argv
+    
+    # argparse rejects multiple commands and unexpected arguments on its own
+    args = parser.parse_args(argv)
+    
+    # No arguments - show help
+    if args.command is None:
+        parser.print_help()
         return
+    
+    COMMANDS[args.command](region, args)
 
 
 if __name__ == "__main__":